@@ -0,0 +1,94 @@
+import cv2
+import numpy as np
+import pytest
+
+from video_streamer.core.camera.mjpeg_http import MJPEGCamera
+
+BOUNDARY = b"myboundary"
+
+
+class Output:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, data):
+        self.frames.append(bytes(data))
+
+
+def _jpeg(seed: int, exif: bool = False) -> bytes:
+    rng = np.random.default_rng(seed)
+    jpeg = cv2.imencode(".jpg", rng.integers(0, 255, (24, 32, 3), np.uint8))[1]
+    jpeg = jpeg.tobytes()
+
+    if exif:
+        # APP1 segment holding a thumbnail, with an EOI of its own
+        thumbnail = cv2.imencode(".jpg", np.zeros((8, 8, 3), np.uint8))[1].tobytes()
+        app1 = b"\xff\xe1" + (len(thumbnail) + 2).to_bytes(2, "big") + thumbnail
+        jpeg = jpeg[:2] + app1 + jpeg[2:]
+
+    return jpeg
+
+
+def _multipart(frames, content_length: bool) -> bytes:
+    parts = []
+
+    for frame in frames:
+        headers = b"--" + BOUNDARY + b"\r\nContent-Type: image/jpeg\r\n"
+
+        if content_length:
+            headers += b"Content-Length: %d\r\n" % len(frame)
+
+        parts.append(headers + b"\r\n" + frame + b"\r\n")
+
+    return b"".join(parts)
+
+
+def _camera(boundary: bytes = BOUNDARY) -> MJPEGCamera:
+    camera = MJPEGCamera("http://localhost/video", 0.05)
+    camera._set_output(Output())
+    camera._reset(boundary)
+    return camera
+
+
+def _feed(camera: MJPEGCamera, stream: bytes, chunk_size: int) -> list:
+    buffer = bytearray()
+
+    for i in range(0, len(stream), chunk_size):
+        buffer.extend(stream[i : i + chunk_size])
+        camera._write_frames(buffer)
+
+    return camera._output.frames
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 100, 65536])
+@pytest.mark.parametrize("content_length", [True, False])
+@pytest.mark.parametrize("exif", [True, False])
+def test_multipart_frames(chunk_size, content_length, exif):
+    frames = [_jpeg(i, exif and i % 2 == 0) for i in range(5)]
+    stream = _multipart(frames, content_length)
+
+    assert _feed(_camera(), stream, chunk_size) == frames
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 65536])
+def test_back_to_back_frames(chunk_size):
+    frames = [_jpeg(i, i == 1) for i in range(5)]
+
+    assert _feed(_camera(b""), b"".join(frames), chunk_size) == frames
+
+
+def test_content_length_headers_split_from_image():
+    # The chunk ends after the part headers, before the image starts
+    frame = _jpeg(0)
+    # The image is deliberately cut short, only its declared size frames it
+    truncated = frame[:-10]
+    stream = _multipart([truncated, frame], True)
+    split = stream.index(b"\xff\xd8")
+
+    camera = _camera()
+    buffer = bytearray(stream[:split])
+    camera._write_frames(buffer)
+    buffer.extend(stream[split:])
+    camera._write_frames(buffer)
+
+    assert camera._output.frames == [truncated, frame]
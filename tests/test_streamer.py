@@ -0,0 +1,38 @@
+import asyncio
+
+from video_streamer.core.streamer import FrameBuffer
+
+
+def _encode(data: int) -> bytes:
+    return b"frame %d" % data
+
+
+def test_frames_encoded_only_with_readers():
+    encoded = []
+    frames = FrameBuffer(lambda data: encoded.append(data) or _encode(data))
+
+    frames.write(1)
+    frames.write(2)
+    assert encoded == []
+
+    frames.add_reader()
+    frames.write(3)
+    assert encoded == [2, 3]
+
+
+def test_reader_gets_latest_frame_written_without_readers():
+    frames = FrameBuffer(_encode)
+
+    async def read():
+        frames.add_reader()
+        frame = await frames.wait(0)
+        frames.remove_reader()
+        return frame
+
+    frames.write(1)
+    assert asyncio.run(read()) == (1, b"frame 1")
+
+    # The camera moves on while nobody is connected, then stops producing
+    frames.write(2)
+    frames.write(3)
+    assert asyncio.run(read()) == (2, b"frame 3")
@@ -0,0 +1,30 @@
+import importlib
+
+from video_streamer.core.camera.base import Camera
+
+__all__ = (
+    "Camera",
+    "LimaCamera",
+    "MJPEGCamera",
+    "RedisCamera",
+    "TestCamera",
+    "VideoTestCamera",
+)
+
+# Camera class -> module, the backends and their dependencies are only
+# imported when the class is first used
+_CAMERA_MODULES = {
+    "LimaCamera": "lima",
+    "MJPEGCamera": "mjpeg_http",
+    "RedisCamera": "redis",
+    "TestCamera": "test",
+    "VideoTestCamera": "test",
+}
+
+
+def __getattr__(name: str):
+    if name not in _CAMERA_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f"{__name__}.{_CAMERA_MODULES[name]}")
+    return getattr(module, name)
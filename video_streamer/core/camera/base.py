@@ -0,0 +1,194 @@
+import logging
+import sys
+import threading
+import cv2
+import numpy as np
+
+from typing import Any, Protocol, Tuple
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+except ImportError:
+    TurboJPEG = None
+    logging.warning("PyTurboJPEG not available, falling back to OpenCV.")
+
+
+class Output(Protocol):
+    """Where the camera writes its frames, ffmpeg's stdin or a FrameBuffer"""
+
+    def write(self, data) -> Any:
+        ...
+
+
+class Camera:
+    def __init__(self, device_uri: str, sleep_time: int, debug: bool = False, redis: str = None, redis_channel: str = None, encoder: str = "turbojpeg"):
+        self._device_uri = device_uri
+        self._sleep_time = sleep_time
+        self._debug = debug
+        self._width = -1
+        self._height = -1
+        self._output = None
+        self._redis = redis
+        self._redis_channel = redis_channel
+        self._quality = 75
+        self._encoder = encoder
+        # Set up on first use, most cameras never encode (ffmpeg, MJPEG input)
+        self._encoder_lock = threading.Lock()
+        self._encoder_ready = False
+        self._tj = None
+        self._cuda_stream = None
+        self._stopped = threading.Event()
+
+    def _poll_once(self) -> None:
+        pass
+
+    def _set_output(self, output: Output) -> None:
+        self._output = output
+        self._write_data = output.write
+
+        if self._redis:
+            import redis
+
+            host, port = self._redis.split(':')
+            self._redis_client = redis.StrictRedis(host=host, port=port)
+
+    def poll_image(self, output: Output) -> None:
+        self._set_output(output)
+        self._poll()
+
+    def stop(self) -> None:
+        """Make poll_image return, once the current frame is written"""
+        self._stopped.set()
+
+    def _poll(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._poll_once()
+            except KeyboardInterrupt:
+                sys.exit(0)
+            except BrokenPipeError:
+                sys.exit(0)
+            except Exception:
+                logging.exception("")
+            finally:
+                pass
+
+    def _setup_encoder(self) -> None:
+        with self._encoder_lock:
+            if self._encoder_ready:
+                return
+
+            if self._encoder == "nvjpeg":
+                self._cuda_stream = self._get_cuda_stream()
+
+            self._tj = self._get_turbojpeg()
+            self._encoder_ready = True
+
+    def _get_turbojpeg(self):
+        if TurboJPEG is None:
+            return None
+
+        try:
+            return TurboJPEG()
+        except Exception:
+            logging.warning("libjpeg-turbo not available, falling back to OpenCV.")
+            return None
+
+    def _get_cuda_stream(self):
+        try:
+            import torch
+            from torchvision.io import encode_jpeg
+        except ImportError:
+            logging.warning("torchvision not available, falling back to libjpeg-turbo.")
+            return None
+
+        if not torch.cuda.is_available():
+            logging.warning("CUDA not available, falling back to libjpeg-turbo.")
+            return None
+
+        try:
+            # A persistent stream avoids setting up a new CUDA context per frame
+            stream = torch.cuda.Stream()
+
+            # Encoding CUDA tensors needs a recent torchvision, check it once
+            # here rather than failing on every frame
+            with torch.cuda.stream(stream):
+                encode_jpeg(torch.zeros((3, 8, 8), dtype=torch.uint8, device="cuda"))
+        except Exception:
+            logging.exception("")
+            logging.warning("nvJPEG encoding failed, falling back to libjpeg-turbo.")
+            return None
+
+        return stream
+
+    @property
+    def size(self) -> Tuple[float, float]:
+        return (self._width, self._height)
+
+    def get_jpeg(self, data, size=(0, 0)) -> bytearray:
+        if not self._encoder_ready:
+            self._setup_encoder()
+
+        if self._cuda_stream is not None:
+            return self._get_jpeg_nvjpeg(data, size)
+
+        arr = self._resize(self._as_array(data), size)
+
+        if self._tj is None:
+            return self._get_jpeg_cv2(arr)
+
+        return self._tj.encode(arr, quality=self._quality, pixel_format=TJPF_RGB)
+
+    def _as_array(self, data) -> np.ndarray:
+        # View raw RGB data as a (height, width, 3) array without copying it
+        if isinstance(data, np.ndarray):
+            return data
+
+        return np.frombuffer(data, dtype=np.uint8).reshape(
+            self._height, self._width, 3
+        )
+
+    def _resize(self, arr: np.ndarray, size=(0, 0)) -> np.ndarray:
+        if not size[0] or tuple(size) == self.size:
+            return arr
+
+        if size[0] * size[1] < self._width * self._height:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_LINEAR
+
+        return cv2.resize(arr, tuple(size), interpolation=interpolation)
+
+    def _get_jpeg_nvjpeg(self, data, size=(0, 0)) -> bytearray:
+        import torch
+        from torchvision.io import encode_jpeg
+        from torchvision.transforms.functional import resize
+
+        with torch.cuda.stream(self._cuda_stream):
+            # Read-only frames make torch warn (once) that the tensor is not
+            # writable; it is only read, to copy it to the GPU
+            t = torch.from_numpy(self._as_array(data))
+
+            t = t.permute(2, 0, 1)
+            t = t.to("cuda", non_blocking=True).contiguous()
+
+            if size[0] and tuple(size) != self.size:
+                t = resize(t, [size[1], size[0]], antialias=True)
+
+            jpeg_data = encode_jpeg(t, quality=self._quality).cpu()
+
+        return jpeg_data.numpy().tobytes()
+
+    def _get_jpeg_cv2(self, arr: np.ndarray) -> bytearray:
+        # OpenCV expects BGR, imencode returns the JPEG in a single array
+        bgr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
+        ok, jpeg_data = cv2.imencode(
+            ".jpg", bgr, [int(cv2.IMWRITE_JPEG_QUALITY), self._quality]
+        )
+
+        if not ok:
+            raise RuntimeError(
+                "Could not encode %sx%s frame to JPEG" % (arr.shape[1], arr.shape[0])
+            )
+
+        return jpeg_data.tobytes()
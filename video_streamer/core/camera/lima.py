@@ -0,0 +1,112 @@
+import time
+import logging
+import struct
+import sys
+import json
+import base64
+from datetime import datetime
+
+from typing import Tuple
+
+from video_streamer.core.camera.base import Camera, Output
+
+try:
+    from PyTango import DeviceProxy, EventType
+except ImportError:
+    logging.warning("PyTango not available.")
+
+# Lima video image header
+_LIMA_HDR = struct.Struct(">IHHqiiHHHH")
+_HSIZE = _LIMA_HDR.size
+
+
+class LimaCamera(Camera):
+    def __init__(self, device_uri: str, sleep_time: int, debug: bool = False, redis: str = None, redis_channel: str = None, **kwargs):
+        super().__init__(device_uri, sleep_time, debug, redis, redis_channel, **kwargs)
+
+        self._lima_tango_device = self._connect(self._device_uri)
+        _, self._width, self._height, _ = self._get_image()
+        self._sleep_time = sleep_time
+        self._last_frame_number = -1
+
+    def _connect(self, device_uri: str) -> DeviceProxy:
+        try:
+            logging.info("Connecting to %s", device_uri)
+            lima_tango_device = DeviceProxy(device_uri)
+            lima_tango_device.ping()
+        except Exception:
+            logging.exception("")
+            logging.info("Could not connect to %s, retrying ...", device_uri)
+            sys.exit(-1)
+        else:
+            return lima_tango_device
+
+    def _get_image(self) -> Tuple[memoryview, float, float, int]:
+        buf = self._lima_tango_device.video_last_image[1]
+
+        header = _LIMA_HDR.unpack_from(buf, 0)
+        _, _, img_mode, frame_number, width, height, _, _, _, _ = header
+
+        raw_data = memoryview(buf)[_HSIZE:]
+
+        return raw_data, width, height, frame_number
+
+    def poll_image(self, output: Output) -> None:
+        self._set_output(output)
+
+        try:
+            event_id = self._lima_tango_device.subscribe_event(
+                "video_last_image_counter",
+                EventType.CHANGE_EVENT,
+                self._on_image_counter_change,
+            )
+        except Exception:
+            logging.warning(
+                "No change events for video_last_image_counter on %s, polling",
+                self._device_uri,
+            )
+            self._poll()
+            return
+
+        # Frames are written from the event callback from here on
+        try:
+            self._stopped.wait()
+        except KeyboardInterrupt:
+            sys.exit(0)
+        finally:
+            self._lima_tango_device.unsubscribe_event(event_id)
+
+    def _on_image_counter_change(self, event) -> None:
+        if event.err:
+            logging.warning("Error event from %s: %s", self._device_uri, event.errors)
+            return
+
+        try:
+            self._write_image(event.attr_value.value)
+        except BrokenPipeError:
+            self._stopped.set()
+        except Exception:
+            logging.exception("")
+
+    def _write_image(self, frame_number: int) -> None:
+        if self._last_frame_number == frame_number:
+            return
+
+        raw_data, width, height, frame_number = self._get_image()
+        self._raw_data = raw_data
+
+        self._write_data(self._raw_data)
+        self._last_frame_number = frame_number
+
+        if self._redis:
+            frame_dict = {
+                "data": base64.b64encode(self._raw_data).decode('utf-8'),
+                "size": (width, height),
+                "time": datetime.now().strftime("%H:%M:%S.%f"),
+                "frame_number": self._last_frame_number,
+            }
+            self._redis_client.publish(self._redis_channel, json.dumps(frame_dict))
+
+    def _poll_once(self) -> None:
+        self._write_image(self._lima_tango_device.video_last_image_counter)
+        time.sleep(self._sleep_time / 2)
@@ -0,0 +1,146 @@
+import re
+import logging
+import requests
+
+from typing import Optional
+
+from video_streamer.core.camera.base import Camera, Output
+
+_JPEG_SOI = b"\xff\xd8"
+_JPEG_EOI = b"\xff\xd9"
+_JPEG_SOS = 0xDA
+
+_CONTENT_LENGTH = re.compile(rb"content-length:\s*(\d+)", re.IGNORECASE)
+_BOUNDARY = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+
+
+def _boundary(content_type: str) -> bytes:
+    # Multipart boundary declared in the Content-Type of the response, if any
+    match = _BOUNDARY.search(content_type)
+    return match.group(1).encode() if match else b""
+
+
+def _content_length(headers: bytes) -> Optional[int]:
+    # Size of the image given in the multipart headers preceding it, if any
+    lengths = _CONTENT_LENGTH.findall(headers)
+    return int(lengths[-1]) if lengths else None
+
+
+def _scan_data_offset(buffer: bytearray) -> Optional[int]:
+    # Offset of the compressed image data, found by skipping the marker
+    # segments after SOI. Embedded (EXIF) thumbnails live in those segments
+    # and contain an EOI of their own. None when the headers are incomplete.
+    pos = 2
+
+    while len(buffer) >= pos + 4:
+        if buffer[pos] != 0xFF:
+            # Not a marker, fall back to scanning from here
+            return pos
+
+        marker = buffer[pos + 1]
+
+        if marker == 0xFF:
+            # Fill byte
+            pos += 1
+            continue
+
+        pos += 2 + ((buffer[pos + 2] << 8) | buffer[pos + 3])
+
+        if marker == _JPEG_SOS:
+            return pos
+
+    return None
+
+
+class MJPEGCamera(Camera):
+    def __init__(self, device_uri: str, sleep_time: int, debug: bool = False, redis: str = None, redis_channel: str = None, **kwargs):
+        super().__init__(device_uri, sleep_time, debug, redis, redis_channel, **kwargs)
+        self._reset()
+
+    def _reset(self, boundary: bytes = b"") -> None:
+        # Parser state, for a new response
+        self._boundary = boundary
+        self._frame_nbytes = None
+        self._scan_from = None
+
+    def poll_image(self, output: Output) -> None:
+        self._set_output(output)
+
+        while not self._stopped.is_set():
+            buffer = bytearray()
+            self._reset()
+
+            try:
+                # auth=("user", "password")
+                r = requests.get(self._device_uri, stream=True)
+
+                if r.status_code != 200:
+                    print("Received unexpected status code {}".format(r.status_code))
+                    self._stopped.wait(self._sleep_time)
+                    continue
+
+                self._reset(_boundary(r.headers.get("Content-Type", "")))
+
+                with r:
+                    for chunk in r.iter_content(chunk_size=65536):
+                        if self._stopped.is_set():
+                            break
+
+                        buffer.extend(chunk)
+                        self._write_frames(buffer)
+            except requests.exceptions.RequestException:
+                logging.exception("")
+                self._stopped.wait(self._sleep_time)
+
+    def _write_frames(self, buffer: bytearray) -> None:
+        # Write each complete JPEG and remove it from the buffer. A frame in
+        # progress is kept at the start of the buffer, together with its size
+        # (from the part headers) or the offset to continue looking for EOI.
+        while True:
+            if not buffer.startswith(_JPEG_SOI):
+                soi = buffer.find(_JPEG_SOI)
+
+                if soi < 0:
+                    # Keep the part headers since the last boundary, they can
+                    # hold the size of the image still to come. Otherwise keep
+                    # enough of the end for a boundary or marker cut in half.
+                    start = buffer.rfind(self._boundary) if self._boundary else -1
+
+                    if start < 0:
+                        start = max(len(buffer) - max(len(self._boundary), 1), 0)
+
+                    del buffer[:start]
+                    return
+
+                self._frame_nbytes = _content_length(buffer[:soi])
+                self._scan_from = None
+                del buffer[:soi]
+
+            if self._frame_nbytes:
+                if len(buffer) < self._frame_nbytes:
+                    return
+
+                end = self._frame_nbytes
+            else:
+                if self._scan_from is None:
+                    self._scan_from = _scan_data_offset(buffer)
+
+                    if self._scan_from is None:
+                        return
+
+                eoi = buffer.find(_JPEG_EOI, self._scan_from)
+
+                if eoi < 0:
+                    # Only the new data needs to be searched next time
+                    self._scan_from = max(self._scan_from, len(buffer) - 1)
+                    return
+
+                end = eoi + 2
+
+            self._write_data(buffer[:end])
+            del buffer[:end]
+            self._frame_nbytes = None
+            self._scan_from = None
+
+    def get_jpeg(self, data, size=None) -> bytearray:
+        return data
@@ -0,0 +1,80 @@
+import redis
+import json
+import base64
+from datetime import datetime
+import cv2
+import numpy as np
+
+from video_streamer.core.camera.base import Camera, Output
+
+
+class RedisCamera(Camera):
+    def __init__(self, device_uri: str, sleep_time: int, debug: bool = False, out_redis: str = None, out_redis_channel: str = None, in_redis_channel: str = 'frames', **kwargs):
+        super().__init__(device_uri, sleep_time, debug, out_redis, out_redis_channel, **kwargs)
+        # for this camera in_redis_... is for the input and redis_... as usual for output
+        self._in_redis_client = self._connect(self._device_uri)
+        # One pubsub connection is kept for the lifetime of the camera
+        self._pubsub = self._in_redis_client.pubsub(ignore_subscribe_messages=True)
+        self._last_frame_number = -1
+        self._in_redis_channel = in_redis_channel
+        self._set_size()
+
+    def _set_size(self):
+        # the size is send via redis, hence we get the information from there
+        self._pubsub.subscribe(self._in_redis_channel)
+        for message in self._pubsub.listen():
+            if message["type"] == "message":
+                frame = json.loads(message["data"])
+                self._width = frame["size"][1]
+                self._height = frame["size"][0]
+                break
+
+        # Do not let frames pile up on the connection until polling starts
+        self._pubsub.unsubscribe(self._in_redis_channel)
+
+    def _connect(self, device_uri: str):
+        host, port = device_uri.replace('redis://', '').split(':')
+        port = port.split('/')[0]
+        return redis.StrictRedis(host=host, port=port)
+
+    def poll_image(self, output: Output) -> None:
+        self._pubsub.subscribe(self._in_redis_channel)
+        self._set_output(output)
+
+        try:
+            self._poll()
+        finally:
+            self._pubsub.unsubscribe(self._in_redis_channel)
+
+    def _poll_once(self) -> None:
+        # Blocks until a frame is published, waking up now and then to see
+        # if the camera was stopped
+        message = self._pubsub.get_message(timeout=1.0)
+
+        if message is None or message["type"] != "message":
+            return
+
+        frame = json.loads(message["data"])
+        self._last_frame_number += 1
+        if self._redis:
+            frame_dict = {
+                "data": frame["data"],
+                "size": frame["size"],
+                "time": datetime.now().strftime("%H:%M:%S.%f"),
+                "frame_number": self._last_frame_number
+            }
+            self._redis_client.publish(self._redis_channel, json.dumps(frame_dict))
+        raw_image_data = base64.b64decode(frame["data"])
+        # ffmpeg needs an rgb encoded image, since we cannot be sure if the image was in rgb or 
+        # bgr(common for cv2 image manipulation) we need these transformations
+        image_array = np.frombuffer(raw_image_data, dtype=np.uint8)
+        frame = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+
+        if frame is None:
+            raise ValueError("Could not decode frame %s" % self._last_frame_number)
+
+        # The decoded frame is ours, convert it in place rather than
+        # allocating and copying another full frame
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+
+        self._write_data(rgb_frame)
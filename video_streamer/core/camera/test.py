@@ -0,0 +1,92 @@
+import time
+import os
+import json
+import base64
+from datetime import datetime
+import cv2
+import numpy as np
+
+from PIL import Image
+
+from video_streamer.core.camera.base import Camera
+
+# The test image and video are kept next to the camera package
+_DATA_DIR = os.path.dirname(os.path.dirname(__file__))
+_FAKEIMG_PATH = os.path.join(_DATA_DIR, "fakeimg.jpg")
+_TESTVIDEO_PATH = os.path.join(_DATA_DIR, "test_video.avi")
+
+
+class TestCamera(Camera):
+    def __init__(self, device_uri: str, sleep_time: int, debug: bool = False, redis: str = None, redis_channel: str = None, **kwargs):
+        super().__init__(device_uri, sleep_time, debug, redis, redis_channel, **kwargs)
+        self._sleep_time = 0.05
+        # The test image never changes, decode it once and keep the raw data
+        with Image.open(_FAKEIMG_PATH, "r") as im:
+            self._raw_data = np.asarray(im.convert("RGB"))
+            self._width, self._height = im.size
+        self._last_frame_number = -1
+
+    def _poll_once(self) -> None:
+        self._write_data(self._raw_data)
+        
+        self._last_frame_number += 1
+        if self._redis:
+            frame_dict = {
+                "data": base64.b64encode(self._raw_data).decode('utf-8'),
+                "size": self.size,
+                "time": datetime.now().strftime("%H:%M:%S.%f"),
+                "frame_number": self._last_frame_number,
+            }
+            self._redis_client.publish(self._redis_channel, json.dumps(frame_dict))
+        
+        time.sleep(self._sleep_time)
+
+
+class VideoTestCamera(Camera):
+    def __init__(self, device_uri: str, sleep_time: int, debug: bool = False, redis: str = None, redis_channel: str = None, **kwargs):
+        super().__init__(device_uri, sleep_time, debug, redis, redis_channel, **kwargs)
+        self._sleep_time = 0.04
+        # for your testvideo, please use an uncompressed video or mjpeg codec, 
+        # otherwise, opencv might have issues with reading the frames.
+        self._testvideo_fpath = _TESTVIDEO_PATH
+        self._current = 0
+        self._video_capture = cv2.VideoCapture(self._testvideo_fpath)
+        self._set_video_dimensions()
+        self._last_frame_number = -1
+
+    def _poll_once(self) -> None:
+        if not self._video_capture.isOpened():
+            print("Video capture is not opened.")
+            return
+        
+        ret, frame = self._video_capture.read()
+        if not ret:
+            # End of video, loop back to the beginning
+            self._video_capture.release()
+            self._video_capture = cv2.VideoCapture(self._testvideo_fpath)
+            ret, frame = self._video_capture.read()
+            if not ret:
+                print("Failed to restart video capture.")
+                return
+            
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        size = (rgb_frame.shape[1], rgb_frame.shape[0])
+        self._write_data(rgb_frame)
+        self._last_frame_number += 1
+        if self._redis:
+            frame_dict = {
+                "data": base64.b64encode(rgb_frame).decode('utf-8'),
+                "size": size,
+                "time": datetime.now().strftime("%H:%M:%S.%f"),
+                "frame_number": self._last_frame_number,
+            }
+            self._redis_client.publish(self._redis_channel, json.dumps(frame_dict))
+        
+        time.sleep(self._sleep_time)
+
+    def _set_video_dimensions(self):
+        if not self._video_capture.isOpened():
+            print("Video capture is not opened.")
+            return
+        self._width = int(self._video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self._height = int(self._video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
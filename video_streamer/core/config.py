@@ -1,6 +1,6 @@
 import sys
 
-from typing import Any, Dict, Optional, Union, Tuple
+from typing import Any, Dict, Literal, Optional, Union, Tuple
 from pathlib import Path
 from pydantic import BaseModel, Field, validate_call, FilePath
 from pydantic_core import ValidationError
@@ -46,6 +46,11 @@ class SourceConfiguration(BaseModel):
         description="Server url postfix/trail.",
         default="",
     )
+    jpeg_encoder: Literal["turbojpeg", "nvjpeg"] = Field(
+        title="JPEG Encoder",
+        description="JPEG encoder used for MJPEG output, turbojpeg or nvjpeg.",
+        default="turbojpeg",
+    )
     size: Tuple[int, int] = Field(
         title="Image Size",
         default=(0, 0),
@@ -1,12 +1,126 @@
+import asyncio
+import logging
+import os
 import subprocess
 import multiprocessing
-import queue
-import time
-from typing import Tuple
+import signal
+import sys
+import threading
+from typing import Any, AsyncIterator, Callable, Tuple
 
-from video_streamer.core.camera import TestCamera, LimaCamera, MJPEGCamera, VideoTestCamera, Camera, RedisCamera
+import video_streamer.core.camera
+from video_streamer.core.camera import Camera
 from video_streamer.core.config import SourceConfiguration
 
+_MJPEG_PREFIX = b"--frame\r\n--!>\nContent-type: image/jpeg\n\n"
+_MJPEG_SUFFIX = b"\r\n"
+
+
+# input_uri -> camera class and the extra source configuration options passed
+# to it. input_uri has to match the test cameras exactly, and start with the
+# prefix of the others. Any other input_uri is a Lima device. The classes are
+# looked up in video_streamer.core.camera, which imports the backend (and its
+# dependencies) on first use.
+_CAMERAS = {
+    "test": ("TestCamera", ()),
+    "videotest": ("VideoTestCamera", ()),
+}
+
+_CAMERA_PREFIXES = (
+    ("http", ("MJPEGCamera", ())),
+    ("redis", ("RedisCamera", ("in_redis_channel",))),
+)
+
+_LIMA_CAMERA = ("LimaCamera", ())
+
+
+class FrameBuffer:
+    """
+    Latest frame written by the camera, encoded once and shared by all readers
+
+    :param callable encode: Encodes a raw camera frame for the readers
+    """
+
+    def __init__(self, encode: Callable[[Any], bytes]):
+        self._encode = encode
+        self._frame = None
+        self._frame_number = 0
+        self._waiters = []
+        self._lock = threading.Lock()
+        self._readers = 0
+        # Raw frame written while there were no readers
+        self._pending = None
+
+    def write(self, data) -> None:
+        # Called from the camera thread, frames are encoded there as long as
+        # someone is reading them
+        with self._lock:
+            if not self._readers:
+                self._pending = data
+                return
+
+            self._pending = None
+
+        self._publish(self._encode(data))
+
+    def _publish(self, frame: bytes) -> None:
+        with self._lock:
+            self._frame = frame
+            self._frame_number += 1
+            waiters, self._waiters = self._waiters, []
+
+        # Wake the readers in their event loop
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_set_done, future)
+            except RuntimeError:
+                # Event loop already closed
+                pass
+
+    def add_reader(self) -> None:
+        with self._lock:
+            self._readers += 1
+
+            if self._pending is None:
+                return
+
+            # Encoded under the lock, so that a newer frame from the camera
+            # cannot be published first
+            frame = self._encode(self._pending)
+            self._pending = None
+
+        self._publish(frame)
+
+    def remove_reader(self) -> None:
+        with self._lock:
+            self._readers -= 1
+
+    async def wait(self, frame_number: int = 0):
+        """
+        Wait for a frame newer than frame_number
+
+        :param int frame_number: Number of the last frame seen by the reader
+        :returns: Current frame number and frame
+        :rtype: tuple
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with self._lock:
+                if self._frame_number > frame_number:
+                    return self._frame_number, self._frame
+
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+
+            await future
+
+
+def _set_done(future: asyncio.Future) -> None:
+    # The reader may have been cancelled (client disconnected) in the meantime
+    if not future.done():
+        future.set_result(None)
+
 
 class Streamer:
     def __init__(self, config: SourceConfiguration, host: str, port: int, debug: bool):
@@ -23,65 +137,87 @@ class Streamer:
         pass
 
     def get_camera(self) -> Camera:
-        if self._config.input_uri == "test":
-            return TestCamera("TANGO_URI", self._expt, False, self._config.redis, self._config.redis_channel)
-        elif self._config.input_uri == "videotest":
-            return VideoTestCamera("TANGO_URI", self._expt, False, self._config.redis, self._config.redis_channel)
-        elif self._config.input_uri.startswith("http"):
-            return MJPEGCamera(self._config.input_uri, self._expt, False, self._config.redis, self._config.redis_channel)
-        elif self._config.input_uri.startswith("redis"):
-            return RedisCamera(self._config.input_uri, self._expt, False, self._config.redis, self._config.redis_channel, self._config.in_redis_channel)
-        
-        return LimaCamera(self._config.input_uri, self._expt, False, self._config.redis, self._config.redis_channel)
+        input_uri = self._config.input_uri
+        camera = _CAMERAS.get(input_uri)
+
+        if camera is None:
+            camera = next(
+                (c for prefix, c in _CAMERA_PREFIXES if input_uri.startswith(prefix)),
+                _LIMA_CAMERA,
+            )
+
+        name, options = camera
+
+        return getattr(video_streamer.core.camera, name)(
+            self._config.input_uri,
+            self._expt,
+            False,
+            self._config.redis,
+            self._config.redis_channel,
+            encoder=self._config.jpeg_encoder,
+            **{option: getattr(self._config, option) for option in options},
+        )
 
 
 class MJPEGStreamer(Streamer):
     def __init__(self, config: SourceConfiguration, host: str, port: int, debug: bool):
         super().__init__(config, host, port, debug)
-        self._poll_image_p = None
+        self._poll_image_t = None
+        self._poll_image_lock = threading.Lock()
         self._expt = 0.05
         self._camera = self.get_camera()
-
-    def start(self) -> None:
-        _q = multiprocessing.Queue(1)
-
-        self._poll_image_p = multiprocessing.Process(
-            target=self._camera.poll_image, args=(_q,)
+        self._frames = FrameBuffer(
+            lambda data: self._camera.get_jpeg(data, self._config.size)
         )
-        self._poll_image_p.start()
 
-        last_frame = _q.get()
+    def _start_polling(self) -> None:
+        # A single polling thread feeds all connected clients
+        with self._poll_image_lock:
+            if self._poll_image_t is None or not self._poll_image_t.is_alive():
+                self._poll_image_t = threading.Thread(
+                    target=self._camera.poll_image, args=(self._frames,), daemon=True
+                )
+                self._poll_image_t.start()
 
-        out_size = self._config.size if self._config.size[0] else self._camera.size
+    async def start(self) -> AsyncIterator[bytes]:
+        self._start_polling()
+        frame_number = 0
 
-        while True:
-            try:
-                _data = _q.get_nowait()
-            except queue.Empty:
-                pass
-            else:
-                last_frame = _data
+        try:
+            # Shows the current image right away, even if the camera has
+            # not written anything since the last reader left
+            self._frames.add_reader()
 
-            yield (
-                b"--frame\r\n--!>\nContent-type: image/jpeg\n\n"
-                + self._camera.get_jpeg(last_frame, out_size)
-                + b"\r\n"
-            )
+            while True:
+                # Waits, without blocking the event loop, for the camera to
+                # publish a new, already encoded, frame
+                frame_number, jpeg_data = await self._frames.wait(frame_number)
 
-            time.sleep(self._expt)
+                # One chunk per frame, so each frame is a single send on the socket
+                yield b"".join((_MJPEG_PREFIX, jpeg_data, _MJPEG_SUFFIX))
+        finally:
+            self._frames.remove_reader()
 
     def stop(self) -> None:
-        if self._poll_image_p:
-            self._poll_image_p.kill()
+        self._camera.stop()
+
+        with self._poll_image_lock:
+            if self._poll_image_t is not None:
+                self._poll_image_t.join(1)
 
 
 class FFMPGStreamer(Streamer):
     def __init__(self, config: SourceConfiguration, host: str, port: int, debug: bool):
         super().__init__(config, host, port, debug)
-        self._ffmpeg_process = None
         self._poll_image_p = None
         self._expt = 0.02
 
+    def __getstate__(self):
+        # Only the configuration is sent to the polling process
+        state = self.__dict__.copy()
+        state["_poll_image_p"] = None
+        return state
+
     def _start_ffmpeg(
         self,
         source_size: Tuple[int, int],
@@ -136,26 +272,43 @@ class FFMPGStreamer(Streamer):
 
         return ffmpeg
 
-    def start(self) -> None:
-        camera = self.get_camera()
+    def _poll_image(self) -> None:
+        # Runs in the polling process. The camera and ffmpeg are created here,
+        # so that neither device connections nor pipes have to be inherited
+        # from, or pickled by, the server process.
+        # Own process group, so that stop() can kill ffmpeg along with it
+        os.setpgrp()
+        signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
 
-        out_size = self._config.size if self._config.size[0] else camera.size
+        try:
+            camera = self.get_camera()
 
-        ffmpeg_p = self._start_ffmpeg(
-            camera.size, out_size, self._config.quality, self._port
-        )
+            out_size = self._config.size if self._config.size[0] else camera.size
 
-        self._poll_image_p = multiprocessing.Process(
-            target=camera.poll_image, args=(ffmpeg_p.stdin,)
-        )
+            ffmpeg_p = self._start_ffmpeg(
+                camera.size, out_size, self._config.quality, self._port
+            )
+        except Exception:
+            logging.exception("Could not start streaming %s", self._config.input_uri)
+            sys.exit(1)
+
+        try:
+            camera.poll_image(ffmpeg_p.stdin)
+        finally:
+            ffmpeg_p.kill()
 
+    def start(self) -> None:
+        self._poll_image_p = multiprocessing.Process(target=self._poll_image)
         self._poll_image_p.start()
-        self._ffmpeg_process = ffmpeg_p
-        return ffmpeg_p
 
     def stop(self) -> None:
-        if self._ffmpeg_process:
-            self._ffmpeg_process.kill()
-
         if self._poll_image_p:
-            self._poll_image_p.kill()
+            self._poll_image_p.terminate()
+            self._poll_image_p.join(1)
+
+            if self._poll_image_p.is_alive():
+                try:
+                    os.killpg(self._poll_image_p.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    # Killed before it created its process group
+                    self._poll_image_p.kill()
@@ -1,5 +1,6 @@
 import uvicorn
 import argparse
+import multiprocessing
 
 from video_streamer.server import create_app
 from video_streamer.core.config import get_config_from_dict, get_config_from_file
@@ -66,6 +67,15 @@ def parse_args() -> None:
         default="MPEG1",
     )
 
+    opt_parser.add_argument(
+        "-je",
+        "--jpeg-encoder",
+        dest="jpeg_encoder",
+        help="JPEG encoder for MJPEG output, turbojpeg or nvjpeg",
+        choices=("turbojpeg", "nvjpeg"),
+        default="turbojpeg",
+    )
+
     opt_parser.add_argument(
         "-id",
         "--id",
@@ -128,6 +138,11 @@ def parse_args() -> None:
 
 
 def run() -> None:
+    # Start polling processes from a small, preloaded, server process instead
+    # of forking the whole web server
+    multiprocessing.set_start_method("forkserver", force=True)
+    multiprocessing.set_forkserver_preload(["video_streamer.core.camera"])
+
     args = parse_args()
 
     if not args.debug:
@@ -148,6 +163,7 @@ def run() -> None:
                     "input_uri": args.uri,
                     "quality": args.quality,
                     "format": args.output_format,
+                    "jpeg_encoder": args.jpeg_encoder,
                     "hash": args.hash,
                     "size": _size,
                     "in_redis_channel": args.in_redis_channel,